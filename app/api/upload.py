@@ -5,6 +5,7 @@ from app.services.vector_store import VectorStore
 from app.services.embedding_service import EmbeddingService
 from app.config import get_settings
 from pathlib import Path
+import asyncio
 import shutil
 from loguru import logger
 from uuid import uuid4
@@ -53,11 +54,30 @@ async def upload_document(file: UploadFile = File(...)):
         # Update total chunks
         metadatas = document_processor.update_total_chunks(metadatas)
         
-        # Generate embeddings
-        embeddings = embedding_service.embed_batch(chunks)
+        # source_file carries the per-upload prefix; dedup needs the name the user uploaded
+        for metadata in metadatas:
+            metadata["original_filename"] = file.filename
+        
+        # Skip chunks whose content is already indexed (Qdrant calls and retries block, so run off the loop)
+        chunks, metadatas = await asyncio.to_thread(vector_store.filter_new_chunks, chunks, metadatas)
+        if not chunks:
+            return UploadResponse(
+                file_id=file_id,
+                filename=file.filename,
+                file_type=file_ext[1:],
+                chunks_created=0,
+                status="success",
+                message="Document content is already indexed"
+            )
+        
+        # Generate dense embeddings (network-bound) and sparse vectors concurrently, off the event loop
+        embeddings, sparse_vectors = await asyncio.gather(
+            asyncio.to_thread(embedding_service.embed_batch, chunks),
+            asyncio.to_thread(vector_store.sparse_service.generate_sparse_vectors_batch, chunks)
+        )
         
         # Store in vector database
-        chunk_ids = vector_store.upsert_chunks(chunks, embeddings, metadatas)
+        chunk_ids = await vector_store.upsert_chunks_async(chunks, embeddings, metadatas, sparse_vectors)
         
         logger.info(f"Successfully processed {len(chunks)} chunks")
         
@@ -14,11 +14,16 @@ class Settings(BaseSettings):
     qdrant_url: str = "http://localhost:6333"
     qdrant_api_key: str | None = None
     qdrant_collection_name: str = "crag_documents"
+    qdrant_prefer_grpc: bool = True  # gRPC/protobuf avoids JSON-encoding every float
+    qdrant_grpc_port: int = 6334
+    qdrant_upsert_batch_size: int = 64
+    qdrant_upsert_max_in_flight: int = 8
     
     # OpenAI Models
     embedding_model: str = "text-embedding-3-small"
     llm_model: str = "gpt-4o-mini"
     embedding_dimensions: int = 1536
+    embedding_cache_size: int = 1024  # Recent query embeddings kept in memory (0 = disabled)
     
     # CRAG Settings
     crag_relevance_threshold: float = 0.7
@@ -34,7 +39,13 @@ class Settings(BaseSettings):
     # Hybrid Search Settings
     hybrid_search_enabled: bool = True
     sparse_vector_enabled: bool = True
-    rrf_k: int = 60  # RRF fusion parameter
+    rrf_k: int = 60  # RRF fusion parameter (same constant for server- and client-side fusion)
+    hybrid_candidate_cache_size: int = 256  # Cached sparse/dense candidate lists for client-side RRF (0 = server-side fusion)
+
+    # Semantic Cache Settings
+    semantic_cache_enabled: bool = True
+    semantic_cache_max_entries: int = 10_000
+    semantic_cache_similarity_threshold: float = 0.97  # Cosine similarity for a paraphrase hit
 
     # HYDE Settings
     hyde_num_hypotheses: int = 3
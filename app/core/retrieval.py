@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from app.services.vector_store import VectorStore
 from app.services.embedding_service import EmbeddingService
 from app.services.hyde import HydeService
@@ -13,6 +14,7 @@ class RetrievalService:
         self.embedding_service = EmbeddingService()
         self.hyde_service = HydeService()
         self._last_hyde_hypotheses = None  # For metadata tracking
+        self._executor = ThreadPoolExecutor(max_workers=2)  # Overlaps embedding API calls with sparse encoding
     
     def retrieve(
         self,
@@ -42,17 +44,20 @@ class RetrievalService:
             hypotheses = self.hyde_service.generate_hypothetical_documents(query)
             self._last_hyde_hypotheses = hypotheses
 
-            # Batch embed all hypotheses
-            hypothesis_vectors = self.embedding_service.embed_batch(hypotheses)
+            # Batch embed all hypotheses while their sparse vectors are generated
+            vectors_future = self._executor.submit(self.embedding_service.embed_batch, hypotheses)
+            sparse_vectors = self._sparse_vectors(hypotheses, search_mode)
+            hypothesis_vectors = vectors_future.result()
 
             # Run parallel searches for each hypothesis
             all_results = []
-            for hypothesis, vector in zip(hypotheses, hypothesis_vectors):
+            for hypothesis, vector, sparse_vector in zip(hypotheses, hypothesis_vectors, sparse_vectors):
                 results = self.vector_store.search(
                     query_vector=vector,
                     query_text=hypothesis,
                     top_k=top_k,
-                    mode=search_mode
+                    mode=search_mode,
+                    sparse_vector=sparse_vector
                 )
                 all_results.extend(results)
 
@@ -63,15 +68,18 @@ class RetrievalService:
                 f"from {len(hypotheses)} hypotheses"
             )
         else:
-            # Standard retrieval pathway
-            query_vector = self.embedding_service.embed_text(query)
+            # Standard retrieval pathway: embed the query while its sparse vector is generated
+            vector_future = self._executor.submit(self.embedding_service.embed_text, query)
+            sparse_vector = self._sparse_vectors([query], search_mode)[0]
+            query_vector = vector_future.result()
 
             # Search vector store
             results = self.vector_store.search(
                 query_vector=query_vector,
                 query_text=query,
                 top_k=top_k,
-                mode=search_mode
+                mode=search_mode,
+                sparse_vector=sparse_vector
             )
 
             # Convert to RetrievedChunk models
@@ -80,6 +88,12 @@ class RetrievalService:
 
         return retrieved_chunks
 
+    def _sparse_vectors(self, texts: list[str], search_mode: str) -> list:
+        """Generate sparse query vectors up front (None for dense-only search)"""
+        if search_mode == "dense":
+            return [None] * len(texts)
+        return self.vector_store.sparse_service.generate_sparse_vectors_batch(texts)
+
     def _convert_to_chunks(self, results: list[dict]) -> list[RetrievedChunk]:
         """Convert vector store results to RetrievedChunk models"""
         chunks = []
@@ -1,6 +1,9 @@
 from openai import OpenAI
 from app.config import get_settings
 from loguru import logger
+from collections import OrderedDict
+import hashlib
+import threading
 
 
 class EmbeddingService:
@@ -8,18 +11,33 @@ class EmbeddingService:
         self.settings = get_settings()
         self.client = OpenAI(api_key=self.settings.openai_api_key)
         self.model = self.settings.embedding_model
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def embed_text(self, text: str) -> list[float]:
-        """Generate embedding for single text"""
+        """Generate embedding for single text, reusing recent results for repeated queries"""
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
         try:
             response = self.client.embeddings.create(
                 model=self.model,
                 input=text
             )
-            return response.data[0].embedding
+            embedding = response.data[0].embedding
         except Exception as e:
             logger.error(f"Embedding generation error: {e}")
             raise
+
+        if self.settings.embedding_cache_size > 0:
+            with self._cache_lock:
+                self._cache[key] = embedding
+                if len(self._cache) > self.settings.embedding_cache_size:
+                    self._cache.popitem(last=False)
+        return embedding
     
     def embed_batch(self, texts: list[str], batch_size: int = 100) -> list[list[float]]:
         """Generate embeddings for batch of texts"""
@@ -0,0 +1,287 @@
+"""
+Semantic cache for vector store search results.
+
+L1 matches the normalized query text exactly; L2 matches the dense query vector
+against recently cached queries by cosine similarity. Entries are evicted in
+least-recently-used order, where an L2 hit counts as a use (SIM-LRU). Results
+are deep-copied on the way in and out, so callers can't mutate cached entries.
+
+Also holds the hybrid candidate cache: per-query sparse/dense candidate lists
+(IDs and payloads) that VectorStore fuses client-side with RRF.
+"""
+
+import copy
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from loguru import logger
+
+from app.config import get_settings
+
+
+@dataclass
+class CacheEntry:
+    """A cached search result and where its query vector lives in the L2 matrix"""
+    text_key: tuple | None
+    scope_id: int
+    slot: int
+    results: list[dict]
+
+
+class SemanticCache:
+    """Two-level (exact text + semantic) cache for search results."""
+
+    MIN_CAPACITY = 64  # initial rows of the L2 matrix; doubles on demand up to max_entries
+
+    def __init__(self, max_entries: int, similarity_threshold: float):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Empty all state (caller holds the lock or is __init__)"""
+        self._entries: OrderedDict[int, CacheEntry] = OrderedDict()  # slot -> entry, LRU order
+        self._text_index: dict[tuple, int] = {}  # (scope id, normalized text) -> slot
+        self._scope_ids: dict[Hashable, int] = {}  # only scopes with live entries
+        self._scope_keys: dict[int, Hashable] = {}
+        self._scope_counts: dict[int, int] = {}  # live entries per scope id
+        self._next_scope_id = 0
+        self._vectors: np.ndarray | None = None  # allocated on first insert, grown on demand
+        self._slot_scopes = np.empty(0, dtype=np.int64)
+        self._num_slots = 0  # slots handed out so far; only these rows are scanned
+        self._free_slots: list[int] = []
+        self._generation = getattr(self, "_generation", 0) + 1
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Lowercase and collapse whitespace so trivial variations share an L1 key"""
+        return re.sub(r"\s+", " ", text.strip().lower())
+
+    @staticmethod
+    def _normalize_vector(vector: list[float]) -> np.ndarray:
+        """Convert to a unit-length float32 array so dot product equals cosine similarity"""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def get(
+        self,
+        scope: Hashable,
+        query_vector: list[float] | None,
+        query_text: str | None = None
+    ) -> tuple[list[dict] | None, int]:
+        """
+        Look up cached results for a query.
+
+        Args:
+            scope: Everything besides the query that affects results (mode, top_k, filters)
+            query_vector: Dense query embedding used for the L2 similarity lookup
+            query_text: Original query text used for the L1 exact lookup
+
+        Returns:
+            Cached results (None on a miss) and the cache generation, which must be
+            passed back to put() so results computed before a clear() are discarded
+        """
+        with self._lock:
+            generation = self._generation
+            results = self._lookup(scope, query_vector, query_text)
+
+        # Entries are never modified in place, so copying outside the lock is safe
+        return (copy.deepcopy(results) if results is not None else None), generation
+
+    def _lookup(
+        self,
+        scope: Hashable,
+        query_vector: list[float] | None,
+        query_text: str | None
+    ) -> list[dict] | None:
+        """L1 then L2 lookup, marking a hit as most recently used (caller holds the lock)"""
+        scope_id = self._scope_ids.get(scope)
+        if scope_id is None:
+            return None
+
+        if query_text:
+            slot = self._text_index.get((scope_id, self.normalize_text(query_text)))
+            if slot is not None:
+                self._entries.move_to_end(slot)
+                return self._entries[slot].results
+
+        if query_vector is None:
+            return None
+
+        query = self._normalize_vector(query_vector)
+        similarities = self._vectors[:self._num_slots] @ query
+        similarities[self._slot_scopes[:self._num_slots] != scope_id] = -np.inf
+        slot = int(np.argmax(similarities))
+
+        if similarities[slot] < self.similarity_threshold:
+            return None
+
+        self._entries.move_to_end(slot)
+        logger.debug(f"Semantic cache hit (similarity {similarities[slot]:.3f})")
+        return self._entries[slot].results
+
+    def put(
+        self,
+        scope: Hashable,
+        query_vector: list[float] | None,
+        results: list[dict],
+        generation: int,
+        query_text: str | None = None
+    ):
+        """
+        Store results for a query, evicting the least recently used entry if full.
+
+        Dropped if the cache was cleared since `generation` was read from get().
+        """
+        if query_vector is None or self.max_entries <= 0:
+            return
+
+        query = self._normalize_vector(query_vector)
+        results = copy.deepcopy(results)
+
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            normalized_text = self.normalize_text(query_text) if query_text else None
+            scope_id = self._scope_ids.get(scope)
+            if scope_id is not None and (scope_id, normalized_text) in self._text_index:
+                self._evict(self._text_index[(scope_id, normalized_text)])
+
+            # Allocate before resolving the scope: eviction may retire this scope's id
+            slot = self._allocate_slot(query.shape[0])
+
+            scope_id = self._scope_ids.get(scope)
+            if scope_id is None:
+                scope_id = self._next_scope_id
+                self._next_scope_id += 1
+                self._scope_ids[scope] = scope_id
+                self._scope_keys[scope_id] = scope
+            self._scope_counts[scope_id] = self._scope_counts.get(scope_id, 0) + 1
+            text_key = (scope_id, normalized_text) if normalized_text else None
+
+            self._vectors[slot] = query
+            self._slot_scopes[slot] = scope_id
+            self._entries[slot] = CacheEntry(
+                text_key=text_key,
+                scope_id=scope_id,
+                slot=slot,
+                results=results
+            )
+            if text_key is not None:
+                self._text_index[text_key] = slot
+
+    def _allocate_slot(self, dimensions: int) -> int:
+        """Reuse a free slot, grow the matrix, or evict the LRU entry (caller holds the lock)"""
+        if self._free_slots:
+            return self._free_slots.pop()
+
+        if self._num_slots >= self.max_entries:
+            self._evict(next(iter(self._entries)))
+            return self._free_slots.pop()
+
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if self._num_slots == capacity:
+            new_capacity = min(max(capacity * 2, self.MIN_CAPACITY), self.max_entries)
+            vectors = np.zeros((new_capacity, dimensions), dtype=np.float32)
+            slot_scopes = np.full(new_capacity, -1, dtype=np.int64)
+            if capacity:
+                vectors[:capacity] = self._vectors
+                slot_scopes[:capacity] = self._slot_scopes
+            self._vectors = vectors
+            self._slot_scopes = slot_scopes
+
+        slot = self._num_slots
+        self._num_slots += 1
+        return slot
+
+    def _evict(self, slot: int):
+        """Remove an entry and free its slot (caller holds the lock)"""
+        entry = self._entries.pop(slot)
+        if entry.text_key is not None:
+            self._text_index.pop(entry.text_key, None)
+
+        self._scope_counts[entry.scope_id] -= 1
+        if not self._scope_counts[entry.scope_id]:
+            del self._scope_counts[entry.scope_id]
+            del self._scope_ids[self._scope_keys.pop(entry.scope_id)]
+
+        self._slot_scopes[slot] = -1
+        self._vectors[slot] = 0.0
+        self._free_slots.append(slot)
+
+    def clear(self):
+        """Drop all entries, e.g. after the underlying collection changes"""
+        with self._lock:
+            self._reset()
+
+
+@dataclass
+class CandidateEntry:
+    """Sparse and dense candidate IDs for one query, plus the payload of every candidate"""
+    depth: int
+    ranked_ids: list[list]
+    payloads: dict
+
+
+class CandidateCache:
+    """LRU cache of hybrid search candidate lists, keyed by query fingerprint."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, CandidateEntry] = OrderedDict()
+        self._generation = 0
+
+    def get(self, key: Hashable, min_depth: int) -> tuple[CandidateEntry | None, int]:
+        """
+        Return the entry for key if it holds at least min_depth candidates per list,
+        along with the generation to pass back to put()
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.depth < min_depth:
+                return None, self._generation
+            self._entries.move_to_end(key)
+            return entry, self._generation
+
+    def put(self, key: Hashable, entry: CandidateEntry, generation: int):
+        """Store an entry unless the cache was cleared since `generation` was read"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries, e.g. after the underlying collection changes"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+@lru_cache
+def get_semantic_cache() -> SemanticCache:
+    """Process-wide cache shared by every VectorStore instance"""
+    settings = get_settings()
+    return SemanticCache(
+        max_entries=settings.semantic_cache_max_entries,
+        similarity_threshold=settings.semantic_cache_similarity_threshold
+    )
+
+
+@lru_cache
+def get_candidate_cache() -> CandidateCache:
+    """Process-wide hybrid candidate cache shared by every VectorStore instance"""
+    return CandidateCache(max_entries=get_settings().hybrid_candidate_cache_size)
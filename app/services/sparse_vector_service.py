@@ -1,13 +1,157 @@
 """
 Sparse Vector Service for BM25-style keyword search.
 Generates sparse vectors from text using tokenization and term frequency analysis.
+IDF weighting is applied server-side by Qdrant (SparseVectorParams(modifier=Modifier.IDF)),
+so vectors only carry raw term frequencies.
 """
 
 import re
 from collections import Counter
+from functools import lru_cache
 from typing import List
+
+import numpy as np
+from loguru import logger
 from qdrant_client.models import SparseVector
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; generate_sparse_vector falls back to regex + Counter
+    njit = None
+
+
+# 32-bit FNV-1a: deterministic across processes, unlike Python's salted hash()
+FNV_OFFSET_BASIS = 2166136261
+FNV_PRIME = 16777619
+
+
+def fnv1a_32(data: bytes) -> int:
+    """Hash bytes to a 32-bit sparse vector index"""
+    h = FNV_OFFSET_BASIS
+    for byte in data:
+        h = ((h ^ byte) * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+def _is_token_byte(c):
+    """[a-z0-9] on lowercased UTF-8 bytes"""
+    return (97 <= c <= 122) or (48 <= c <= 57)
+
+
+@lru_cache(maxsize=1)
+def _word_char_table() -> np.ndarray:
+    """Unicode \\w membership (str.isalnum() or '_') for every code point, as re uses it"""
+    return np.fromiter(
+        (chr(cp).isalnum() or cp == 95 for cp in range(0x110000)),
+        dtype=np.bool_,
+        count=0x110000
+    )
+
+
+def _is_word_at(data, pos, word_table):
+    """Whether the UTF-8 encoded character starting at pos is a Unicode word character"""
+    c = np.int64(data[pos])
+    if c < 0x80:
+        return word_table[c]
+    if c >= 0xF0:
+        cp = ((c & 0x07) << 18) | ((np.int64(data[pos + 1]) & 0x3F) << 12) \
+            | ((np.int64(data[pos + 2]) & 0x3F) << 6) | (np.int64(data[pos + 3]) & 0x3F)
+    elif c >= 0xE0:
+        cp = ((c & 0x0F) << 12) | ((np.int64(data[pos + 1]) & 0x3F) << 6) \
+            | (np.int64(data[pos + 2]) & 0x3F)
+    else:
+        cp = ((c & 0x1F) << 6) | (np.int64(data[pos + 1]) & 0x3F)
+    return word_table[cp]
+
+
+def _is_word_before(data, pos, word_table):
+    """Whether the character ending just before byte pos is a Unicode word character"""
+    start = pos - 1
+    while start > 0 and (data[start] & 0xC0) == 0x80:
+        start -= 1
+    return _is_word_at(data, start, word_table)
+
+
+def _count_terms(data, stop_hashes, word_table):
+    """
+    Tokenize lowercased UTF-8 bytes and count hashed terms.
+
+    Mirrors re.findall(r'\\b[a-z0-9]+(?:-[a-z0-9]+)*\\b', text) including its Unicode
+    word boundaries (multi-byte characters are decoded and looked up in word_table),
+    drops tokens whose hash is in the sorted stop_hashes array, and counts the rest
+    in an open-addressing table sized so it can never fill up.
+
+    Returns:
+        (indices, values) in first-seen order, as uint32 hashes and float32 counts
+    """
+    n = data.shape[0]
+    capacity = 16
+    while capacity < n + 2:
+        capacity *= 2
+    mask = capacity - 1
+
+    keys = np.zeros(capacity, dtype=np.uint32)
+    counts = np.zeros(capacity, dtype=np.float32)
+    used = np.zeros(capacity, dtype=np.bool_)
+    order = np.empty(capacity, dtype=np.int64)
+    num_terms = 0
+
+    i = 0
+    while i < n:
+        if not _is_token_byte(data[i]) or (i > 0 and _is_word_before(data, i, word_table)):
+            i += 1
+            continue
+
+        # Greedily consume [a-z0-9]+(?:-[a-z0-9]+)*, remembering the last segment end that
+        # is followed by '-' so we can backtrack there if the final end lacks a word boundary
+        h = np.uint32(FNV_OFFSET_BASIS)
+        j = i
+        fallback_end = -1
+        fallback_hash = np.uint32(0)
+        while True:
+            while j < n and _is_token_byte(data[j]):
+                h = np.uint32((h ^ np.uint32(data[j])) * np.uint32(FNV_PRIME))
+                j += 1
+            if j + 1 < n and data[j] == 45 and _is_token_byte(data[j + 1]):
+                fallback_end = j
+                fallback_hash = h
+                h = np.uint32((h ^ np.uint32(45)) * np.uint32(FNV_PRIME))
+                j += 1
+            else:
+                break
+
+        if j < n and _is_word_at(data, j, word_table):
+            if fallback_end < 0:
+                i += 1
+                continue
+            j = fallback_end
+            h = fallback_hash
+        i = j
+
+        stop_pos = np.searchsorted(stop_hashes, h)
+        if stop_pos < stop_hashes.shape[0] and stop_hashes[stop_pos] == h:
+            continue
+
+        slot = np.int64(h) & mask
+        while used[slot] and keys[slot] != h:
+            slot = (slot + 1) & mask
+        if not used[slot]:
+            used[slot] = True
+            keys[slot] = h
+            order[num_terms] = slot
+            num_terms += 1
+        counts[slot] += 1.0
+
+    slots = order[:num_terms]
+    return keys[slots], counts[slots]
+
+
+if njit is not None:
+    _is_token_byte = njit(cache=True, inline="always")(_is_token_byte)
+    _is_word_at = njit(cache=True)(_is_word_at)
+    _is_word_before = njit(cache=True)(_is_word_before)
+    _count_terms = njit(cache=True)(_count_terms)
+
 
 class SparseVectorService:
     """Service for generating sparse vectors for BM25-style search."""
@@ -24,7 +168,14 @@ class SparseVectorService:
 
     def __init__(self):
         """Initialize the sparse vector service."""
-        pass
+        self._stop_hashes = np.array(
+            sorted({fnv1a_32(word.encode()) for word in self.STOP_WORDS}),
+            dtype=np.uint32
+        )
+        if njit is None:
+            logger.info("Numba not installed, using pure-Python sparse tokenization")
+        else:
+            _word_char_table()  # build once up front rather than on the first request
 
     def tokenize(self, text: str) -> List[str]:
         """
@@ -50,7 +201,7 @@ class SparseVectorService:
     def _hash_token(self, token: str) -> int:
         """
         Hash a token to a consistent index.
-        Uses Python's built-in hash function with modulo to create stable indices.
+        Uses 32-bit FNV-1a so indices are stable across processes and restarts.
 
         Args:
             token: Token to hash
@@ -58,9 +209,7 @@ class SparseVectorService:
         Returns:
             Integer index in sparse vector space
         """
-        # Use Python's hash and ensure positive integer
-        # Modulo 2^32 to keep indices in reasonable range
-        return abs(hash(token)) % (2**32)
+        return fnv1a_32(token.encode("utf-8"))
 
     def generate_sparse_vector(self, text: str) -> SparseVector:
         """
@@ -70,8 +219,13 @@ class SparseVectorService:
             text: Input text to convert to sparse vector
 
         Returns:
-            SparseVector with token indices and term frequencies
+            SparseVector with token indices and raw term frequencies (no IDF)
         """
+        if njit is not None:
+            data = np.frombuffer(text.lower().encode("utf-8", "surrogatepass"), dtype=np.uint8)
+            indices, values = _count_terms(data, self._stop_hashes, _word_char_table())
+            return SparseVector(indices=indices.tolist(), values=values.tolist())
+
         # Tokenize text
         tokens = self.tokenize(text)
 
@@ -1,34 +1,115 @@
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import (
     Distance, VectorParams, PointStruct,
-    Filter, FieldCondition, MatchValue,
+    Filter, FieldCondition, MatchValue, MatchAny, PayloadSchemaType,
     SparseVector, SparseVectorParams, Modifier,
-    Prefetch, FusionQuery, Fusion
+    Prefetch, RrfQuery, Rrf,
+    QueryRequest, ScoredPoint,
+    HnswConfigDiff, ScalarQuantization, ScalarQuantizationConfig, ScalarType
 )
 from app.config import get_settings
+from app.services.semantic_cache import CandidateEntry, get_candidate_cache, get_semantic_cache
 from app.services.sparse_vector_service import SparseVectorService
 from loguru import logger
+from functools import lru_cache
 from uuid import uuid4
+import asyncio
+import hashlib
 import time
 
+import numpy as np
+
+# Keep idle gRPC connections alive instead of re-handshaking after quiet periods
+GRPC_OPTIONS = {"grpc.keepalive_time_ms": 30000}
+
+# Strong references to async client close() tasks scheduled from reset_connection
+_pending_closes: set[asyncio.Task] = set()
+
+
+@lru_cache(maxsize=1)
+def get_qdrant_client(
+    url: str,
+    api_key: str | None,
+    prefer_grpc: bool,
+    grpc_port: int
+) -> QdrantClient:
+    """Shared Qdrant client, so every VectorStore reuses one connection pool"""
+    return QdrantClient(
+        url=url,
+        api_key=api_key,
+        prefer_grpc=prefer_grpc,
+        grpc_port=grpc_port,
+        grpc_options=dict(GRPC_OPTIONS),
+        timeout=10,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_qdrant_client(
+    url: str,
+    api_key: str | None,
+    prefer_grpc: bool,
+    grpc_port: int
+) -> AsyncQdrantClient:
+    """Shared async Qdrant client used for pipelined upserts"""
+    return AsyncQdrantClient(
+        url=url,
+        api_key=api_key,
+        prefer_grpc=prefer_grpc,
+        grpc_port=grpc_port,
+        grpc_options=dict(GRPC_OPTIONS),
+        timeout=10,
+    )
+
+
+def content_hash(chunk: str) -> str:
+    """Stable hash of chunk text, stored in the payload to detect duplicates"""
+    return hashlib.sha1(chunk.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=256)
+def _build_filter(conditions: tuple[tuple[str, object], ...]) -> Filter:
+    """Build (and memoize) a Qdrant filter matching every (key, value) pair"""
+    return Filter(
+        must=[
+            FieldCondition(key=key, match=MatchValue(value=value))
+            for key, value in conditions
+        ]
+    )
+
 
 class VectorStore:
     MAX_RETRIES = 3
     RETRY_DELAY = 1.0  # seconds
+    HEALTH_CHECK_TTL = 30.0  # seconds between health checks on a known-good client
 
     def __init__(self):
         self.settings = get_settings()
         self.collection_name = self.settings.qdrant_collection_name
         self._client = None
+        self._async_client = None
         self._initialized = False
+        self._last_health_ok_ts = 0.0
         self.sparse_service = SparseVectorService()
+        self.cache = get_semantic_cache() if self.settings.semantic_cache_enabled else None
+        self.candidate_cache = get_candidate_cache()
 
     def _create_client(self) -> QdrantClient:
-        """Create a new Qdrant client instance"""
-        return QdrantClient(
-            url=self.settings.qdrant_url,
-            api_key=self.settings.qdrant_api_key if self.settings.qdrant_api_key else None,
-            timeout=10,
+        """Return the process-wide Qdrant client for the configured URL"""
+        return get_qdrant_client(
+            self.settings.qdrant_url,
+            self.settings.qdrant_api_key or None,
+            self.settings.qdrant_prefer_grpc,
+            self.settings.qdrant_grpc_port,
+        )
+
+    def _create_async_client(self) -> AsyncQdrantClient:
+        """Return the process-wide async Qdrant client for the configured URL"""
+        return get_async_qdrant_client(
+            self.settings.qdrant_url,
+            self.settings.qdrant_api_key or None,
+            self.settings.qdrant_prefer_grpc,
+            self.settings.qdrant_grpc_port,
         )
 
     def _health_check(self, client: QdrantClient) -> bool:
@@ -41,11 +122,11 @@ class VectorStore:
             return False
 
     def _connect_with_retry(self) -> QdrantClient:
-        """Connect to Qdrant with retry logic"""
+        """Connect to Qdrant with retry logic, retrying the health check on the shared client"""
         last_error = None
+        client = self._create_client()
         for attempt in range(1, self.MAX_RETRIES + 1):
             try:
-                client = self._create_client()
                 if self._health_check(client):
                     logger.info(f"Connected to Qdrant at {self.settings.qdrant_url}")
                     return client
@@ -60,64 +141,138 @@ class VectorStore:
 
     @property
     def client(self) -> QdrantClient:
-        """Lazy initialization of Qdrant client with health check"""
+        """
+        Lazy initialization of Qdrant client.
+
+        A healthy client is trusted for HEALTH_CHECK_TTL seconds, so most calls skip the
+        extra get_collections round-trip; the collection check runs once per connection.
+        """
         if self._client is None:
             self._client = self._connect_with_retry()
-            self._ensure_collection()
-        elif not self._health_check(self._client):
-            logger.warning("Qdrant connection lost, reconnecting...")
-            self._client = self._connect_with_retry()
+            self._last_health_ok_ts = time.monotonic()
+        elif time.monotonic() - self._last_health_ok_ts > self.HEALTH_CHECK_TTL:
+            if self._health_check(self._client):
+                self._last_health_ok_ts = time.monotonic()
+            else:
+                logger.warning("Qdrant connection lost, reconnecting...")
+                self._client = self._connect_with_retry()
+                self._last_health_ok_ts = time.monotonic()
+                self._initialized = False
+
+        if not self._initialized:
             self._ensure_collection()
         return self._client
 
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Lazy initialization of async Qdrant client for pipelined upserts"""
+        if self._async_client is None:
+            self._async_client = self._create_async_client()
+        return self._async_client
+
+    def _close_shared_clients(self):
+        """Close the cached clients so their gRPC channels and HTTP pools are released"""
+        if get_qdrant_client.cache_info().currsize:
+            try:
+                self._create_client().close()
+            except Exception as e:
+                logger.warning(f"Error closing Qdrant client: {e}")
+
+        if get_async_qdrant_client.cache_info().currsize:
+            close = self._create_async_client().close()
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            try:
+                if loop is None:
+                    asyncio.run(close)
+                else:
+                    task = loop.create_task(close)
+                    _pending_closes.add(task)
+                    task.add_done_callback(_pending_closes.discard)
+            except Exception as e:
+                logger.warning(f"Error closing async Qdrant client: {e}")
+
     def reset_connection(self):
         """Force reconnection on next client access"""
+        self._close_shared_clients()
+        get_qdrant_client.cache_clear()
+        get_async_qdrant_client.cache_clear()
         self._client = None
+        self._async_client = None
         self._initialized = False
+        self._last_health_ok_ts = 0.0
         logger.info("Qdrant connection reset")
     
     def _ensure_collection(self):
         """Create hybrid collection with dense and sparse vectors if it doesn't exist"""
         try:
-            collections = self.client.get_collections().collections
-            exists = any(c.name == self.collection_name for c in collections)
-
-            if not exists:
-                self.client.create_collection(
+            if not self._client.collection_exists(self.collection_name):
+                self._client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config={
+                        # Originals live on disk; HNSW traversal uses the INT8 copy held in RAM
                         "dense": VectorParams(
                             size=self.settings.embedding_dimensions,
-                            distance=Distance.COSINE
+                            distance=Distance.COSINE,
+                            on_disk=True,
+                            quantization_config=ScalarQuantization(
+                                scalar=ScalarQuantizationConfig(
+                                    type=ScalarType.INT8,
+                                    quantile=0.99,
+                                    always_ram=True
+                                )
+                            )
                         )
                     },
+                    hnsw_config=HnswConfigDiff(m=16, ef_construct=100, on_disk=False),
                     sparse_vectors_config={
-                        "sparse": SparseVectorParams()
+                        # Vectors carry raw term frequencies; Qdrant applies IDF at query time
+                        "sparse": SparseVectorParams(modifier=Modifier.IDF)
                     }
                 )
                 logger.info(f"Created hybrid collection: {self.collection_name}")
+
+            # Idempotent, so collections created before these fields existed get indexed too
+            for field_name in ("source_file", "original_filename", "content_hash"):
+                self._client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
+            self._initialized = True
         except Exception as e:
             logger.error(f"Collection creation error: {e}")
             raise
     
-    def upsert_chunks(
+    def _invalidate_cache(self):
+        """Drop cached search results once the collection contents change"""
+        if self.cache is not None:
+            self.cache.clear()
+        self.candidate_cache.clear()
+
+    def _build_points(
         self,
         chunks: list[str],
         embeddings: list[list[float]],
-        metadatas: list[dict]
-    ) -> list[str]:
-        """Insert chunks with both dense and sparse vectors"""
-        points = []
-        chunk_ids = []
+        metadatas: list[dict],
+        sparse_vectors: list[SparseVector] | None = None
+    ) -> tuple[list[str], list[PointStruct]]:
+        """
+        Build points with both dense and sparse vectors.
 
-        for chunk, embedding, metadata in zip(chunks, embeddings, metadatas):
-            chunk_id = str(uuid4())
-            chunk_ids.append(chunk_id)
+        Sparse vectors are generated here unless the caller already computed them
+        (e.g. while the dense embedding request was in flight).
+        """
+        if sparse_vectors is None:
+            sparse_vectors = self.sparse_service.generate_sparse_vectors_batch(chunks)
 
-            # Generate sparse vector for the chunk
-            sparse_vector = self.sparse_service.generate_sparse_vector(chunk)
+        chunk_ids = [str(uuid4()) for _ in chunks]
 
-            points.append(PointStruct(
+        # Inputs are already the exact types Qdrant expects, so skip per-point pydantic validation
+        points = [
+            PointStruct.model_construct(
                 id=chunk_id,
                 vector={
                     "dense": embedding,
@@ -125,20 +280,163 @@ class VectorStore:
                 },
                 payload={
                     "content": chunk,
+                    "content_hash": content_hash(chunk),
                     **metadata
                 }
-            ))
+            )
+            for chunk_id, chunk, embedding, sparse_vector, metadata in zip(
+                chunk_ids, chunks, embeddings, sparse_vectors, metadatas
+            )
+        ]
+
+        return chunk_ids, points
+
+    def filter_new_chunks(
+        self,
+        chunks: list[str],
+        metadatas: list[dict]
+    ) -> tuple[list[str], list[dict]]:
+        """
+        Drop chunks whose content is already stored for the same document (or
+        repeated within this batch), so duplicates skip embedding and upsert entirely.
+
+        Documents are identified by the "original_filename" metadata field, since
+        source_file is unique per upload. Dedup is scoped per document: a chunk shared
+        by two documents is stored once for each, so results keep the right attribution
+        and delete_by_source on one never removes content the other depends on.
+        Chunks without an original_filename are deduplicated against the whole collection.
+
+        Args:
+            chunks: Chunk texts
+            metadatas: Metadata for each chunk
+
+        Returns:
+            The chunks and metadatas that still need indexing
+        """
+        keys = [
+            (metadata.get("original_filename"), content_hash(chunk))
+            for chunk, metadata in zip(chunks, metadatas)
+        ]
+        hashes_by_document: dict[str | None, list[str]] = {}
+        for original_filename, chunk_hash in dict.fromkeys(keys):
+            hashes_by_document.setdefault(original_filename, []).append(chunk_hash)
+
+        batch_size = self.settings.qdrant_upsert_batch_size
+        existing = set()
 
         try:
-            self.client.upsert(
-                collection_name=self.collection_name,
-                points=points
-            )
+            for original_filename, hashes in hashes_by_document.items():
+                for i in range(0, len(hashes), batch_size):
+                    conditions = [FieldCondition(key="content_hash", match=MatchAny(any=hashes[i:i + batch_size]))]
+                    if original_filename is not None:
+                        conditions.append(
+                            FieldCondition(key="original_filename", match=MatchValue(value=original_filename))
+                        )
+
+                    offset = None
+                    while True:
+                        points, offset = self.client.scroll(
+                            collection_name=self.collection_name,
+                            scroll_filter=Filter(must=conditions),
+                            limit=batch_size,
+                            offset=offset,
+                            with_payload=["content_hash"],
+                            with_vectors=False
+                        )
+                        existing.update((original_filename, point.payload["content_hash"]) for point in points)
+                        if offset is None:
+                            break
+        except Exception as e:
+            logger.error(f"Duplicate check error: {e}")
+            self._last_health_ok_ts = 0.0
+            raise
+
+        new_chunks = []
+        new_metadatas = []
+        for chunk, metadata, key in zip(chunks, metadatas, keys):
+            if key in existing:
+                continue
+            existing.add(key)
+            new_chunks.append(chunk)
+            new_metadatas.append(metadata)
+
+        skipped = len(chunks) - len(new_chunks)
+        if skipped:
+            logger.info(f"Skipping {skipped} duplicate chunks already indexed")
+        return new_chunks, new_metadatas
+
+    def _batches(self, points: list[PointStruct]) -> list[list[PointStruct]]:
+        """Split points into upsert-sized batches"""
+        batch_size = self.settings.qdrant_upsert_batch_size
+        return [points[i:i + batch_size] for i in range(0, len(points), batch_size)]
+
+    def upsert_chunks(
+        self,
+        chunks: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict],
+        sparse_vectors: list[SparseVector] | None = None
+    ) -> list[str]:
+        """Insert chunks with both dense and sparse vectors"""
+        chunk_ids, points = self._build_points(chunks, embeddings, metadatas, sparse_vectors)
+
+        try:
+            for batch in self._batches(points):
+                self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=batch
+                )
             logger.info(f"Upserted {len(points)} chunks with dual vectors")
             return chunk_ids
         except Exception as e:
             logger.error(f"Upsert error: {e}")
+            self._last_health_ok_ts = 0.0
             raise
+        finally:
+            # Earlier batches may have landed even on failure
+            self._invalidate_cache()
+
+    async def upsert_chunks_async(
+        self,
+        chunks: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict],
+        sparse_vectors: list[SparseVector] | None = None
+    ) -> list[str]:
+        """
+        Insert chunks with up to `qdrant_upsert_max_in_flight` batches in flight at once,
+        so total upsert time tracks the slowest batch rather than the sum of all batches.
+        """
+        chunk_ids, points = self._build_points(chunks, embeddings, metadatas, sparse_vectors)
+
+        # Verify the connection and collection off the event loop (retries sleep)
+        await asyncio.to_thread(lambda: self.client)
+        semaphore = asyncio.Semaphore(self.settings.qdrant_upsert_max_in_flight)
+
+        async def _upsert_batch(batch: list[PointStruct]):
+            async with semaphore:
+                await self.async_client.upsert(
+                    collection_name=self.collection_name,
+                    points=batch
+                )
+
+        tasks = [asyncio.create_task(_upsert_batch(batch)) for batch in self._batches(points)]
+        try:
+            await asyncio.gather(*tasks)
+            logger.info(f"Upserted {len(points)} chunks with dual vectors")
+            return chunk_ids
+        except BaseException as e:
+            # Stop batches that have not been sent yet once one fails (or the caller is
+            # cancelled), and wait for them so their outcomes are retrieved before returning
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.error(f"Upsert error: {e!r}")
+            self._last_health_ok_ts = 0.0
+            raise
+        finally:
+            # Batches may have landed even on failure
+            self._invalidate_cache()
     
     def search_dense(
         self,
@@ -160,10 +458,12 @@ class VectorStore:
         self,
         query_text: str,
         top_k: int,
-        search_filter=None
+        search_filter=None,
+        sparse_query: SparseVector | None = None
     ) -> list:
         """Sparse-only keyword search (BM25)"""
-        sparse_query = self.sparse_service.generate_sparse_vector(query_text)
+        if sparse_query is None:
+            sparse_query = self.sparse_service.generate_sparse_vector(query_text)
 
         return self.client.query_points(
             collection_name=self.collection_name,
@@ -179,21 +479,180 @@ class VectorStore:
         query_vector: list[float],
         query_text: str,
         top_k: int,
-        search_filter=None
+        search_filter=None,
+        sparse_query: SparseVector | None = None
     ) -> list:
-        """Hybrid search with RRF fusion"""
-        sparse_query = self.sparse_service.generate_sparse_vector(query_text)
+        """
+        Hybrid search with RRF fusion.
 
-        return self.client.query_points(
-            collection_name=self.collection_name,
-            prefetch=[
-                Prefetch(query=sparse_query, using="sparse", limit=top_k * 3),
-                Prefetch(query=query_vector, using="dense", limit=top_k * 3)
-            ],
-            query=FusionQuery(fusion=Fusion.RRF),
-            limit=top_k,
-            with_payload=True
-        ).points
+        With the candidate cache enabled, the sparse and dense candidates are fetched
+        in one batched request, cached process-wide per query, and fused client-side,
+        so repeating a query at the same or a smaller top_k skips Qdrant entirely.
+        Otherwise fusion runs server-side with the same RRF constant.
+        """
+        if sparse_query is None:
+            sparse_query = self.sparse_service.generate_sparse_vector(query_text)
+        candidate_limit = top_k * 3
+
+        if self.settings.hybrid_candidate_cache_size <= 0 or search_filter is not None:
+            return self.client.query_points(
+                collection_name=self.collection_name,
+                prefetch=[
+                    Prefetch(query=sparse_query, using="sparse", limit=candidate_limit),
+                    Prefetch(query=query_vector, using="dense", limit=candidate_limit)
+                ],
+                query=self._rrf_query(),
+                query_filter=search_filter,
+                limit=top_k,
+                with_payload=True
+            ).points
+
+        cache_key = (query_text, np.asarray(query_vector, dtype=np.float32).tobytes()[:64])
+        entry, generation = self.candidate_cache.get(cache_key, candidate_limit)
+
+        if entry is None:
+            # One round-trip, same as server-side fusion; payloads ride along so the
+            # fused results need no follow-up request
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    QueryRequest(query=sparse_query, using="sparse", limit=candidate_limit, with_payload=True),
+                    QueryRequest(query=query_vector, using="dense", limit=candidate_limit, with_payload=True)
+                ]
+            )
+            entry = CandidateEntry(
+                depth=candidate_limit,
+                ranked_ids=[[point.id for point in response.points] for response in responses],
+                payloads={
+                    point.id: point.payload
+                    for response in responses
+                    for point in response.points
+                }
+            )
+            self.candidate_cache.put(cache_key, entry, generation)
+
+        fused = self._fuse_rrf([ids[:candidate_limit] for ids in entry.ranked_ids], top_k)
+
+        return [
+            ScoredPoint.model_construct(id=point_id, score=score, payload=entry.payloads[point_id])
+            for point_id, score in fused
+        ]
+
+    def _rrf_query(self) -> RrfQuery:
+        """Server-side RRF using the same constant as _fuse_rrf"""
+        return RrfQuery(rrf=Rrf(k=self.settings.rrf_k))
+
+    def _fuse_rrf(self, ranked_lists: list[list], top_k: int) -> list[tuple]:
+        """
+        Reciprocal Rank Fusion over ranked ID lists, matching Qdrant's RRF:
+        score = sum(1 / (rrf_k + rank)) with 0-based ranks.
+
+        Returns:
+            Top (point_id, score) pairs, highest score first
+        """
+        positions = {}
+        point_ids = []
+        point_indices = []
+        ranks = []
+
+        for ids in ranked_lists:
+            for rank, point_id in enumerate(ids):
+                if point_id not in positions:
+                    positions[point_id] = len(point_ids)
+                    point_ids.append(point_id)
+                point_indices.append(positions[point_id])
+                ranks.append(rank)
+
+        if not point_ids:
+            return []
+
+        scores = np.zeros(len(point_ids), dtype=np.float64)
+        np.add.at(
+            scores,
+            np.asarray(point_indices),
+            1.0 / (self.settings.rrf_k + np.asarray(ranks, dtype=np.float64))
+        )
+        order = np.argsort(-scores, kind="stable")[:top_k]
+
+        return [(point_ids[i], float(scores[i])) for i in order]
+
+    def _format_hits(self, results: list) -> list[dict]:
+        """Convert Qdrant hits to result dicts with content split from metadata"""
+        formatted = []
+        for hit in results:
+            # Copy rather than mutate: payloads may be shared with the candidate cache
+            metadata = dict(hit.payload)
+            content = metadata.pop("content", None)
+            formatted.append({
+                "id": hit.id,
+                "score": hit.score,
+                "content": content,
+                "metadata": metadata
+            })
+        return formatted
+
+    def search_all_modes(
+        self,
+        query_vector: list[float],
+        query_text: str,
+        top_k: int = 5,
+        modes: tuple[str, ...] = ("dense", "sparse", "hybrid"),
+        sparse_vector: SparseVector | None = None
+    ) -> dict[str, list[dict]]:
+        """
+        Run several search modes for the same query in one round-trip.
+
+        Args:
+            query_vector: Dense embedding vector
+            query_text: Original query text
+            top_k: Number of results to return per mode
+            modes: Search modes to run - any of "dense", "sparse", "hybrid"
+            sparse_vector: Precomputed sparse vector for query_text (generated if omitted)
+
+        Returns:
+            Mapping of mode to search results with scores and metadata
+        """
+        invalid = [mode for mode in modes if mode not in ("dense", "sparse", "hybrid")]
+        if invalid:
+            raise ValueError(f"Invalid search mode(s): {invalid}. Must be 'dense', 'sparse', or 'hybrid'")
+
+        try:
+            if sparse_vector is None and any(mode != "dense" for mode in modes):
+                sparse_vector = self.sparse_service.generate_sparse_vector(query_text)
+
+            requests = []
+            for mode in modes:
+                if mode == "dense":
+                    requests.append(QueryRequest(
+                        query=query_vector, using="dense", limit=top_k, with_payload=True
+                    ))
+                elif mode == "sparse":
+                    requests.append(QueryRequest(
+                        query=sparse_vector, using="sparse", limit=top_k, with_payload=True
+                    ))
+                else:
+                    requests.append(QueryRequest(
+                        prefetch=[
+                            Prefetch(query=sparse_vector, using="sparse", limit=top_k * 3),
+                            Prefetch(query=query_vector, using="dense", limit=top_k * 3)
+                        ],
+                        query=self._rrf_query(),
+                        limit=top_k,
+                        with_payload=True
+                    ))
+
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=requests
+            )
+            return {
+                mode: self._format_hits(response.points)
+                for mode, response in zip(modes, responses)
+            }
+        except Exception as e:
+            logger.error(f"Search error: {e}")
+            self._last_health_ok_ts = 0.0
+            raise
 
     def search(
         self,
@@ -201,7 +660,8 @@ class VectorStore:
         top_k: int = 5,
         filter_conditions: dict | None = None,
         mode: str = "hybrid",
-        query_text: str | None = None
+        query_text: str | None = None,
+        sparse_vector: SparseVector | None = None
     ) -> list[dict]:
         """
         Search for similar chunks using specified mode.
@@ -209,18 +669,24 @@ class VectorStore:
         Args:
             query_vector: Dense embedding vector
             top_k: Number of results to return
-            filter_conditions: Optional filter conditions
+            filter_conditions: Optional exact-match payload conditions, e.g. {"source_file": "a.pdf"}
             mode: Search mode - "dense", "sparse", or "hybrid" (default)
             query_text: Original query text (required for sparse/hybrid modes)
+            sparse_vector: Precomputed sparse vector for query_text (generated if omitted)
 
         Returns:
             List of search results with scores and metadata
         """
         try:
-            search_filter = None
-            if filter_conditions:
-                # Build Qdrant filter from conditions if needed
-                pass
+            conditions = tuple(sorted(filter_conditions.items())) if filter_conditions else None
+            cache_scope = (mode, top_k, conditions)
+            if self.cache is not None:
+                cached, cache_generation = self.cache.get(cache_scope, query_vector, query_text)
+                if cached is not None:
+                    logger.info(f"Search cache hit (mode: {mode})")
+                    return cached
+
+            search_filter = _build_filter(conditions) if conditions else None
 
             # Delegate to appropriate search method
             if mode == "dense":
@@ -228,25 +694,24 @@ class VectorStore:
             elif mode == "sparse":
                 if not query_text:
                     raise ValueError("query_text required for sparse search")
-                results = self.search_sparse(query_text, top_k, search_filter)
+                results = self.search_sparse(query_text, top_k, search_filter, sparse_vector)
             elif mode == "hybrid":
                 if not query_text:
                     raise ValueError("query_text required for hybrid search")
-                results = self.search_hybrid(query_vector, query_text, top_k, search_filter)
+                results = self.search_hybrid(
+                    query_vector, query_text, top_k, search_filter, sparse_vector
+                )
             else:
                 raise ValueError(f"Invalid search mode: {mode}. Must be 'dense', 'sparse', or 'hybrid'")
 
-            return [
-                {
-                    "id": hit.id,
-                    "score": hit.score,
-                    "content": hit.payload.get("content"),
-                    "metadata": {k: v for k, v in hit.payload.items() if k != "content"}
-                }
-                for hit in results
-            ]
+            formatted = self._format_hits(results)
+
+            if self.cache is not None:
+                self.cache.put(cache_scope, query_vector, formatted, cache_generation, query_text)
+            return formatted
         except Exception as e:
             logger.error(f"Search error: {e}")
+            self._last_health_ok_ts = 0.0
             raise
     
     def delete_by_source(self, source_file: str):
@@ -254,16 +719,10 @@ class VectorStore:
         try:
             self.client.delete(
                 collection_name=self.collection_name,
-                points_selector=Filter(
-                    must=[
-                        FieldCondition(
-                            key="source_file",
-                            match=MatchValue(value=source_file)
-                        )
-                    ]
-                )
+                points_selector=_build_filter((("source_file", source_file),))
             )
             logger.info(f"Deleted chunks from: {source_file}")
+            self._invalidate_cache()
         except Exception as e:
             logger.error(f"Delete error: {e}")
             raise